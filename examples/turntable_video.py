@@ -9,8 +9,10 @@ from tqdm import tqdm
 from f3d_extras import (
     download_file_if_url,
     image_sequence_to_video,
+    render_frames,
     turntable_interpolator,
 )
+from f3d_extras.timeline import frame_count
 
 
 def main():
@@ -20,6 +22,7 @@ def main():
     duration = 5
     fps = 30
     turns = 1
+    motion_blur_subframes = 1  # set > 1 to average that many renders per frame
     model_fn = "https://github.com/KhronosGroup/glTF-Sample-Models/raw/main/2.0/DamagedHelmet/glTF-Binary/DamagedHelmet.glb"
     hdri_fn = "https://dl.polyhaven.org/file/ph-assets/HDRIs/hdr/2k/industrial_sunset_02_puresky_2k.hdr"
     video_path = Path(gettempdir()) / "f3d-turntable.mp4"
@@ -48,15 +51,16 @@ def main():
 
     camera_state_interpolator = turntable_interpolator(engine, turns=turns)
 
-    def render_images():
-        time = 0.0
-        while time < duration:
-            camera_state_interpolator(time / duration)
-            yield engine.window.render_to_image()
-            time += 1.0 / fps
+    images = render_frames(
+        engine,
+        camera_state_interpolator,
+        fps,
+        duration,
+        subframes=motion_blur_subframes,
+    )
 
     image_sequence_to_video(
-        tqdm(render_images(), total=fps * duration),  # tqdm for progress bar
+        tqdm(images, total=frame_count(fps, duration)),  # tqdm for progress bar
         fps,
         video_path,
     )
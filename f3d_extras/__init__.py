@@ -1,7 +1,15 @@
+from .compare import (
+    check_render_regressions,
+    compare_image_directories,
+    compare_images,
+)
 from .files import download_file, download_file_if_url
+from .progressive import progressive_turntable_video
+from .timeline import frame_times, render_frames, subframe_times
 from .turntable import turntable_interpolator, turntable_state_interpolator
 from .video import (
     ffmpeg_output_args_mp4,
     ffmpeg_output_args_webm,
     image_sequence_to_video,
+    image_sequence_to_video_async,
 )
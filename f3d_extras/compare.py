@@ -0,0 +1,267 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from math import inf, log10
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import f3d
+import numpy as np
+from numpy.typing import NDArray
+
+from .images import array_to_image, camera_state_from_screenshot, image_to_array
+
+CHANNEL_PEAKS = {
+    f3d.Image.ChannelType.BYTE: 255.0,
+    f3d.Image.ChannelType.SHORT: 65535.0,
+    f3d.Image.ChannelType.FLOAT: 1.0,
+}
+
+
+@dataclass(frozen=True)
+class ImageDiff:
+    """Difference metrics between two images, normalized so that `1.0` is the
+    full range of the images' channel type."""
+
+    max_abs_error: float
+    mean_abs_error: float
+    psnr: float
+    diff_pixel_count: int
+    pixel_count: int
+
+    @property
+    def diff_pixel_ratio(self) -> float:
+        return self.diff_pixel_count / self.pixel_count if self.pixel_count else 0.0
+
+    def passed(self, tolerance: float = 0) -> bool:
+        """Whether at most a `tolerance` ratio of the pixels differ."""
+        return self.diff_pixel_ratio <= tolerance
+
+
+@dataclass
+class BatchComparison:
+    """Outcome of a batch of image comparisons, keyed by image name.
+
+    `errors` holds the images that could not be compared (e.g. a missing or
+    unreadable candidate) and `stopped_early` tells whether `fail_fast` cancelled
+    pending comparisons, in which case `diffs` and `errors` are incomplete."""
+
+    tolerance: float = 0
+    diffs: dict[str, ImageDiff] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    stopped_early: bool = False
+
+    @property
+    def failed(self) -> list[str]:
+        """Names of the images that errored or differ by more than `tolerance`."""
+        return sorted(
+            {*self.errors}
+            | {n for n, d in self.diffs.items() if not d.passed(self.tolerance)}
+        )
+
+    @property
+    def passed(self) -> bool:
+        return not self.failed and not self.stopped_early
+
+
+def compare_images(
+    a: f3d.Image | Path | str,
+    b: f3d.Image | Path | str,
+    *,
+    threshold: float = 0,
+    diff_path: Path | str | None = None,
+) -> ImageDiff:
+    """Compute difference metrics between two images of the same size and type.
+
+    A pixel is counted as different when any of its channels differs by more than
+    `threshold` (normalized to `0 <= threshold <= 1`). If `diff_path` is provided,
+    a grayscale image of the per-pixel maximum difference is saved to it."""
+    a = a if isinstance(a, f3d.Image) else f3d.Image(Path(a))
+    b = b if isinstance(b, f3d.Image) else f3d.Image(Path(b))
+    if (a.width, a.height, a.channel_count, a.channel_type) != (
+        b.width,
+        b.height,
+        b.channel_count,
+        b.channel_type,
+    ):
+        raise ValueError(
+            f"cannot compare {a.width}x{a.height}x{a.channel_count} {a.channel_type}"
+            f" image to {b.width}x{b.height}x{b.channel_count} {b.channel_type} image"
+        )
+
+    peak = CHANNEL_PEAKS[a.channel_type]
+    abs_diff = np.abs(
+        image_to_array(a).astype(np.float32) - image_to_array(b).astype(np.float32)
+    )
+    abs_diff /= peak
+    pixel_diff = abs_diff.max(axis=2)
+    mse = float(np.mean(np.square(abs_diff, dtype=np.float64)))
+
+    if diff_path is not None:
+        diff = np.rint(np.clip(pixel_diff, 0, 1) * 255).astype(np.uint8)
+        array_to_image(diff).save(Path(diff_path))
+
+    return ImageDiff(
+        max_abs_error=float(pixel_diff.max(initial=0)),
+        mean_abs_error=float(abs_diff.mean()) if abs_diff.size else 0.0,
+        psnr=10 * log10(1 / mse) if mse > 0 else inf,
+        diff_pixel_count=int(np.count_nonzero(pixel_diff > threshold)),
+        pixel_count=pixel_diff.size,
+    )
+
+
+def render_and_compare(
+    engine: f3d.Engine,
+    reference: f3d.Image | Path | str,
+    *,
+    threshold: float = 0,
+    diff_path: Path | str | None = None,
+) -> ImageDiff:
+    """Re-render the engine's scene at the size and with the camera of a reference
+    screenshot saved from the F3D application, then compare the result to it."""
+    reference_image = (
+        reference if isinstance(reference, f3d.Image) else f3d.Image(Path(reference))
+    )
+    engine.window.size = reference_image.width, reference_image.height
+    engine.window.camera.state = camera_state_from_screenshot(reference)
+    render = engine.window.render_to_image(
+        no_background=reference_image.channel_count == 4
+    )
+    return compare_images(
+        reference_image, render, threshold=threshold, diff_path=diff_path
+    )
+
+
+def compare_image_directories(
+    reference_dir: Path | str,
+    candidate_dir: Path | str,
+    *,
+    threshold: float = 0,
+    tolerance: float = 0,
+    diff_dir: Path | str | None = None,
+    pattern: str = "*.png",
+    max_workers: int | None = None,
+    fail_fast: bool = False,
+) -> BatchComparison:
+    """Compare every image matching `pattern` in `reference_dir` to the image of the
+    same name in `candidate_dir` using a process pool.
+
+    References without a candidate are reported as errors without being compared.
+    With `fail_fast`, comparisons still pending are cancelled as soon as one image
+    fails the `tolerance`."""
+    result = BatchComparison(tolerance)
+    references = sorted(Path(reference_dir).glob(pattern))
+    for ref in references:
+        if not (Path(candidate_dir) / ref.name).is_file():
+            result.errors[ref.name] = f"no candidate image for {ref}"
+    if fail_fast and result.errors:
+        result.stopped_early = True
+        return result
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {
+            executor.submit(
+                _compare_files,
+                ref,
+                Path(candidate_dir) / ref.name,
+                threshold,
+                _diff_path(diff_dir, ref.name),
+            ): ref.name
+            for ref in references
+            if ref.name not in result.errors
+        }
+        return _collect(executor, futures, result, fail_fast)
+
+
+def check_render_regressions(
+    reference_dir: Path | str,
+    scene_files: Iterable[Path | str],
+    options: Mapping[str, Any] | None = None,
+    *,
+    threshold: float = 0,
+    tolerance: float = 0,
+    diff_dir: Path | str | None = None,
+    pattern: str = "*.png",
+    max_workers: int | None = None,
+    fail_fast: bool = False,
+) -> BatchComparison:
+    """Re-render `scene_files` with `options` for every F3D screenshot matching
+    `pattern` in `reference_dir`, using each screenshot's camera, and compare the
+    renders to the screenshots using a process pool.
+
+    Each worker process creates its own offscreen engine and loads the scene once.
+    With `fail_fast`, renders still pending are cancelled as soon as one image
+    fails the `tolerance`."""
+    scene = [str(f) for f in scene_files]
+    with ProcessPoolExecutor(
+        max_workers,
+        # the parent may hold an OpenGL context, which is not safe to fork
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_render_worker,
+        initargs=(scene, dict(options or {})),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _render_and_compare_file,
+                ref,
+                threshold,
+                _diff_path(diff_dir, ref.name),
+            ): ref.name
+            for ref in sorted(Path(reference_dir).glob(pattern))
+        }
+        return _collect(executor, futures, BatchComparison(tolerance), fail_fast)
+
+
+def _diff_path(diff_dir: Path | str | None, name: str):
+    return None if diff_dir is None else Path(diff_dir) / name
+
+
+def _collect(
+    executor: ProcessPoolExecutor,
+    futures: dict[Future[ImageDiff], str],
+    result: BatchComparison,
+    fail_fast: bool,
+) -> BatchComparison:
+    for future in as_completed(futures):
+        name = futures[future]
+        try:
+            result.diffs[name] = future.result()
+        except Exception as e:
+            result.errors[name] = str(e) or repr(e)
+        if fail_fast and (
+            name in result.errors or not result.diffs[name].passed(result.tolerance)
+        ):
+            result.stopped_early = any(not f.done() for f in futures)
+            executor.shutdown(wait=True, cancel_futures=True)
+            break
+    result.diffs = dict(sorted(result.diffs.items()))
+    result.errors = dict(sorted(result.errors.items()))
+    return result
+
+
+def _compare_files(
+    reference: Path, candidate: Path, threshold: float, diff_path: Path | None
+):
+    return compare_images(
+        reference, candidate, threshold=threshold, diff_path=diff_path
+    )
+
+
+_worker_engine: f3d.Engine | None = None
+
+
+def _init_render_worker(scene_files: list[str], options: dict[str, Any]):
+    global _worker_engine
+    _worker_engine = f3d.Engine.create(offscreen=True)
+    _worker_engine.options.update(options)
+    if scene_files:
+        _worker_engine.scene.add([Path(f) for f in scene_files])
+
+
+def _render_and_compare_file(
+    reference: Path, threshold: float, diff_path: Path | None
+):
+    assert _worker_engine is not None, "render worker not initialized"
+    return render_and_compare(
+        _worker_engine, reference, threshold=threshold, diff_path=diff_path
+    )
@@ -1,7 +1,16 @@
 import json
 from pathlib import Path
+from typing import Any
 
 import f3d
+import numpy as np
+from numpy.typing import NDArray
+
+CHANNEL_DTYPES = {
+    f3d.Image.ChannelType.BYTE: np.uint8,
+    f3d.Image.ChannelType.SHORT: np.uint16,
+    f3d.Image.ChannelType.FLOAT: np.float32,
+}
 
 
 def copy_image_metadata(src: f3d.Image, dst: f3d.Image):
@@ -32,3 +41,26 @@ def camera_state_from_screenshot(screenshot: f3d.Image | Path | str):
         )
     except (KeyError, ValueError):
         raise ValueError(f"invalid camera metadata in {screenshot}")
+
+
+def image_to_array(image: f3d.Image) -> NDArray[Any]:
+    """View an image's content as a `(height, width, channels)` array."""
+    dtype = CHANNEL_DTYPES[image.channel_type]
+    return np.frombuffer(image.content, dtype=dtype).reshape(
+        image.height, image.width, image.channel_count
+    )
+
+
+def array_to_image(array: NDArray[Any]) -> f3d.Image:
+    """Build an image from a `(height, width)` or `(height, width, channels)` array."""
+    if array.ndim == 2:
+        array = array[:, :, np.newaxis]
+    height, width, channels = array.shape
+    for channel_type, dtype in CHANNEL_DTYPES.items():
+        if array.dtype == dtype:
+            break
+    else:
+        raise ValueError(f"unsupported array dtype {array.dtype}")
+    image = f3d.Image(width, height, channels, channel_type)
+    image.content = np.ascontiguousarray(array).tobytes()
+    return image
@@ -0,0 +1,140 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+import f3d
+
+from .timeline import render_frames
+from .turntable import turntable_interpolator
+from .video import ffmpeg_output_args_mp4, image_sequence_to_video
+
+PREVIEW_OPTIONS: dict[str, Any] = {
+    "render.effect.antialiasing.enable": False,
+    "render.effect.ambient_occlusion": False,
+    "render.effect.translucency_support": False,
+    "render.background.blur.enable": False,
+}
+"""Options overridden during the preview pass to make it cheaper to render."""
+
+
+@dataclass(frozen=True)
+class RenderPass:
+    """Summary of one rendered and encoded video pass."""
+
+    path: Path
+    resolution: tuple[int, int]
+    fps: float
+    frame_count: int
+    seconds: float
+    cancelled: bool = False
+
+
+@dataclass(frozen=True)
+class ProgressiveRender:
+    preview: RenderPass
+    final: RenderPass | None
+    """`None` if the preview was rejected before starting the final pass."""
+
+
+def progressive_turntable_video(
+    engine: f3d.Engine,
+    preview_path: Path | str,
+    final_path: Path | str,
+    fps: float,
+    duration: float,
+    *,
+    turns: float = 1,
+    subframes: int = 1,
+    preview_scale: float = 0.25,
+    preview_fps: float = 10,
+    preview_options: Mapping[str, Any] = PREVIEW_OPTIONS,
+    output_args: Iterable[str | int | float] = ffmpeg_output_args_mp4(),
+    approve_preview: Callable[[RenderPass], bool] | None = None,
+    cancel: Event | None = None,
+) -> ProgressiveRender:
+    """Render a turntable video of the engine's scene twice: first a quick preview at
+    `preview_scale` times the window size and at most `preview_fps`, with
+    `preview_options` overridden, then the final video at full size and `fps`.
+
+    Both passes reuse the loaded scene and follow the same camera path, starting from
+    the engine's current camera. The final pass is skipped if `approve_preview`
+    returns `False` for the preview, and stops early (removing its partial output)
+    once `cancel` is set, e.g. from another thread reviewing the preview."""
+    camera_state = engine.window.camera.state
+    interpolator = turntable_interpolator(engine, turns=turns)
+    final_resolution: tuple[int, int] = engine.window.size
+    w, h = final_resolution
+    preview_resolution = even_size(w * preview_scale), even_size(h * preview_scale)
+
+    original_options = {k: engine.options[k] for k in preview_options}
+    engine.window.size = preview_resolution
+    engine.options.update(dict(preview_options))
+    try:
+        preview = encode_pass(
+            render_frames(engine, interpolator, min(preview_fps, fps), duration),
+            Path(preview_path),
+            min(preview_fps, fps),
+            output_args,
+        )
+    finally:
+        engine.options.update(original_options)
+        engine.window.size = final_resolution
+        engine.window.camera.state = camera_state
+
+    if (approve_preview and not approve_preview(preview)) or (
+        cancel and cancel.is_set()
+    ):
+        return ProgressiveRender(preview, None)
+
+    try:
+        final = encode_pass(
+            render_frames(engine, interpolator, fps, duration, subframes=subframes),
+            Path(final_path),
+            fps,
+            output_args,
+            cancel,
+        )
+    finally:
+        engine.window.camera.state = camera_state
+
+    return ProgressiveRender(preview, final)
+
+
+def encode_pass(
+    images: Iterable[f3d.Image],
+    path: Path,
+    fps: float,
+    output_args: Iterable[str | int | float],
+    cancel: Event | None = None,
+) -> RenderPass:
+    """Encode `images` to `path` and time it, stopping early if `cancel` is set.
+    The reported resolution is the one of the first encoded image."""
+    frame_count = 0
+    resolution = 0, 0
+    cancelled = False
+
+    def counted_until_cancelled() -> Iterator[f3d.Image]:
+        nonlocal frame_count, resolution, cancelled
+        for image in images:
+            if frame_count == 0:
+                resolution = image.width, image.height
+            frame_count += 1
+            yield image
+            if cancel and cancel.is_set():
+                cancelled = True
+                return
+
+    t0 = time.perf_counter()
+    image_sequence_to_video(counted_until_cancelled(), fps, path, output_args)
+    seconds = time.perf_counter() - t0
+
+    if cancelled:
+        path.unlink(missing_ok=True)
+    return RenderPass(path, resolution, fps, frame_count, seconds, cancelled)
+
+
+def even_size(size: float) -> int:
+    """Round a dimension to a positive even number as required by most encoders."""
+    return max(2, 2 * round(size / 2))
@@ -0,0 +1,79 @@
+from typing import Callable, Iterator
+
+import f3d
+import numpy as np
+
+from .images import array_to_image, image_to_array
+
+
+def frame_count(fps: float, duration: float) -> int:
+    """Number of frames in `duration` seconds at `fps` frames per second."""
+    return round(fps * duration)
+
+
+def frame_times(fps: float, duration: float) -> Iterator[float]:
+    """Yield the `0 <= t < 1` value of each of the `fps * duration` frames.
+
+    Each `t` is computed from the integer frame index rather than by accumulating
+    `1 / fps`, so the frame count is exact and there is no floating point drift."""
+    n = frame_count(fps, duration)
+    return (i / n for i in range(n))
+
+
+def subframe_times(
+    fps: float, duration: float, subframes: int, *, shutter: float = 1
+) -> Iterator[tuple[float, ...]]:
+    """Yield the `t` values of `subframes` samples for each frame, evenly spread
+    over the first `shutter` fraction of the frame's interval."""
+    if subframes < 1:
+        raise ValueError(f"subframes must be at least 1, got {subframes}")
+    if not 0 < shutter <= 1:
+        raise ValueError(f"shutter must be in the (0, 1] range, got {shutter}")
+    n = frame_count(fps, duration)
+    return (
+        tuple((i + shutter * k / subframes) / n for k in range(subframes))
+        for i in range(n)
+    )
+
+
+def render_frames(
+    engine: f3d.Engine,
+    interpolator: Callable[[float], None],
+    fps: float,
+    duration: float,
+    *,
+    subframes: int = 1,
+    shutter: float = 1,
+    no_background: bool = False,
+) -> Iterator[f3d.Image]:
+    """Render each frame of the timeline after calling `interpolator(t)`, such as
+    the function returned by `turntable_interpolator`.
+
+    With `subframes > 1`, each frame is the average of `subframes` renders spread
+    over the frame's `shutter` interval (motion blur). The renders are accumulated
+    into a float32 buffer allocated once and reused for the whole sequence."""
+
+    def render(t: float):
+        interpolator(t)
+        return engine.window.render_to_image(no_background=no_background)
+
+    if subframes == 1:
+        yield from map(render, frame_times(fps, duration))
+        return
+
+    accumulator = output = None
+    for times in subframe_times(fps, duration, subframes, shutter=shutter):
+        for k, t in enumerate(times):
+            pixels = image_to_array(render(t))
+            if accumulator is None or output is None:
+                accumulator = np.empty(pixels.shape, dtype=np.float32)
+                output = np.empty(pixels.shape, dtype=pixels.dtype)
+            if k == 0:
+                np.copyto(accumulator, pixels)
+            else:
+                accumulator += pixels
+        accumulator *= 1 / subframes
+        if np.issubdtype(output.dtype, np.integer):
+            np.rint(accumulator, out=accumulator)
+        np.copyto(output, accumulator, casting="unsafe")
+        yield array_to_image(output)
@@ -1,7 +1,9 @@
+import asyncio
+import contextlib
 from itertools import chain
 from pathlib import Path
 import subprocess
-from typing import Iterable, Iterator, Literal
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Literal, TypeVar
 
 import f3d
 
@@ -11,6 +13,8 @@ FfmpegLoglevelStr = Literal[
 ]
 FfmpegLoglevel = int | FfmpegLoglevelStr
 
+T = TypeVar("T")
+
 
 def ffmpeg_output_args_mp4(*, crf: int = 8):
     """Basic `ffmpeg` arguments to encode `.mp4` videos."""
@@ -75,19 +79,18 @@ def ffmpeg_encode_sequence(
 ):
     """Encode raw frames by piping to an `ffmpeg` subprocess."""
 
-    def build_command() -> Iterator[str]:
-        res = f"{resolution[0]}x{resolution[1]}"
-        yield str(ffmpeg_executable)
-        yield from ("-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", res)
-        yield from ("-r", f"{fps}", "-i", "-")
-        if vflip:
-            yield from ("-vf", "vflip")
-        if output_args:
-            yield from map(str, output_args)
-        yield from ("-loglevel", str(loglevel))
-        yield from (str(out_path), "-y")
-
-    command = list(build_command())
+    command = list(
+        ffmpeg_command(
+            resolution,
+            fps,
+            out_path,
+            output_args=output_args,
+            vflip=vflip,
+            pix_fmt=pix_fmt,
+            ffmpeg_executable=ffmpeg_executable,
+            loglevel=loglevel,
+        )
+    )
     proc = subprocess.Popen(command, stdin=subprocess.PIPE)
     if stdin := proc.stdin:
         for frame in frames:
@@ -95,3 +98,142 @@ def ffmpeg_encode_sequence(
             stdin.flush()
         stdin.close()
     proc.wait()
+
+
+async def image_sequence_to_video_async(
+    images: AsyncIterable[f3d.Image] | Iterable[f3d.Image],
+    fps: float,
+    out_path: Path | str,
+    output_args: Iterable[str | int | float] = ffmpeg_output_args_mp4(),
+    ffmpeg_executable: Path | str = "ffmpeg",
+    loglevel: FfmpegLoglevel = "error",
+    semaphore: asyncio.Semaphore | None = None,
+):
+    """Encode F3D images to video using `ffmpeg` without blocking the event loop.
+    See `ffmpeg_encode_sequence_async`."""
+
+    it = aiter(images) if isinstance(images, AsyncIterable) else aiter_sync(images)
+    first = await anext(it)  # pop the first frame so we can check the resolution
+
+    async def raw_frames():
+        yield first.content
+        async for image in it:
+            yield image.content
+
+    await ffmpeg_encode_sequence_async(
+        raw_frames(),
+        (first.width, first.height),
+        fps=fps,
+        out_path=out_path,
+        output_args=output_args,
+        vflip=True,
+        pix_fmt="rgb24",
+        loglevel=loglevel,
+        ffmpeg_executable=ffmpeg_executable,
+        semaphore=semaphore,
+    )
+
+
+async def ffmpeg_encode_sequence_async(
+    frames: AsyncIterable[bytes] | Iterable[bytes],
+    resolution: tuple[int, int],
+    fps: float,
+    out_path: Path | str,
+    output_args: Iterable[str | int | float] = ffmpeg_output_args_mp4(),
+    vflip: bool = False,
+    pix_fmt: str = "rgb24",
+    ffmpeg_executable: Path | str = "ffmpeg",
+    loglevel: FfmpegLoglevel = "error",
+    semaphore: asyncio.Semaphore | None = None,
+):
+    """Encode raw frames by piping to an `ffmpeg` subprocess from a coroutine.
+
+    Writes wait on the pipe's backpressure. If the encode is cancelled or fails,
+    `ffmpeg` is terminated and the partial output is removed. A non-zero exit of
+    `ffmpeg` raises `subprocess.CalledProcessError`. Encodes sharing a `semaphore`
+    run at most as many at once as the semaphore allows."""
+
+    async with semaphore or contextlib.nullcontext():
+        command = list(
+            ffmpeg_command(
+                resolution,
+                fps,
+                out_path,
+                output_args=output_args,
+                vflip=vflip,
+                pix_fmt=pix_fmt,
+                ffmpeg_executable=ffmpeg_executable,
+                loglevel=loglevel,
+            )
+        )
+        proc = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE
+        )
+        try:
+            if stdin := proc.stdin:
+                it = frames if isinstance(frames, AsyncIterable) else aiter_sync(frames)
+                try:
+                    async for frame in it:
+                        stdin.write(frame)
+                        await stdin.drain()
+                    stdin.close()
+                    await stdin.wait_closed()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # ffmpeg exited early, reported through its return code
+            if await proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, command)
+        except BaseException:
+            try:
+                await terminate_process(proc)
+            finally:
+                Path(out_path).unlink(missing_ok=True)
+            raise
+
+
+async def terminate_process(proc: asyncio.subprocess.Process, timeout: float = 5):
+    """Close a subprocess' `stdin` and terminate it, killing it if it does not exit
+    within `timeout` seconds or if this coroutine is itself cancelled."""
+    if proc.stdin:
+        proc.stdin.close()
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+        raise
+
+
+def ffmpeg_command(
+    resolution: tuple[int, int],
+    fps: float,
+    out_path: Path | str,
+    output_args: Iterable[str | int | float] = ffmpeg_output_args_mp4(),
+    vflip: bool = False,
+    pix_fmt: str = "rgb24",
+    ffmpeg_executable: Path | str = "ffmpeg",
+    loglevel: FfmpegLoglevel = "error",
+) -> Iterator[str]:
+    """Build the `ffmpeg` command line to encode raw frames read from `stdin`."""
+    res = f"{resolution[0]}x{resolution[1]}"
+    yield str(ffmpeg_executable)
+    yield from ("-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", res)
+    yield from ("-r", f"{fps}", "-i", "-")
+    if vflip:
+        yield from ("-vf", "vflip")
+    if output_args:
+        yield from map(str, output_args)
+    yield from ("-loglevel", str(loglevel))
+    yield from (str(out_path), "-y")
+
+
+async def aiter_sync(items: Iterable[T]) -> AsyncIterator[T]:
+    """Wrap a regular iterable as an async iterator."""
+    for item in items:
+        yield item
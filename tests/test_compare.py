@@ -0,0 +1,213 @@
+import json
+from math import inf, log10
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import f3d
+import numpy as np
+from pytest import approx, raises  # type: ignore
+
+from f3d_extras.compare import (
+    check_render_regressions,
+    compare_image_directories,
+    compare_images,
+    render_and_compare,
+)
+from f3d_extras.images import array_to_image, image_to_array
+
+
+def test_image_array_roundtrip():
+    array = np.arange(4 * 3 * 3, dtype=np.uint8).reshape(3, 4, 3)
+    image = array_to_image(array)
+
+    assert (image.width, image.height, image.channel_count) == (4, 3, 3)
+    assert image.channel_type == f3d.Image.ChannelType.BYTE
+    assert np.array_equal(image_to_array(image), array)
+
+
+def test_compare_identical_images():
+    image = array_to_image(np.full((8, 6, 3), 42, dtype=np.uint8))
+    diff = compare_images(image, image)
+
+    assert diff.max_abs_error == 0
+    assert diff.mean_abs_error == 0
+    assert diff.psnr == inf
+    assert diff.diff_pixel_count == 0
+    assert diff.pixel_count == 8 * 6
+    assert diff.passed()
+
+
+def test_compare_images_metrics():
+    a = np.zeros((10, 10, 3), dtype=np.uint8)
+    b = a.copy()
+    b[0, :5, 0] = 255  # 5 pixels fully off on one channel
+    b[1, :5, :] = 51  # 5 pixels slightly off on all channels
+
+    diff = compare_images(array_to_image(a), array_to_image(b), threshold=0.25)
+
+    mse = (5 * 1.0**2 + 15 * 0.2**2) / 300
+    assert diff.max_abs_error == approx(1.0)
+    assert diff.mean_abs_error == approx((5 * 1.0 + 15 * 0.2) / 300)
+    assert diff.psnr == approx(10 * log10(1 / mse))
+    assert diff.diff_pixel_count == 5
+    assert diff.diff_pixel_ratio == approx(0.05)
+    assert not diff.passed()
+    assert diff.passed(tolerance=0.05)
+
+
+def test_compare_images_size_mismatch():
+    a = f3d.Image(4, 4, 3, f3d.Image.ChannelType.BYTE)
+    b = f3d.Image(4, 4, 4, f3d.Image.ChannelType.BYTE)
+
+    with raises(ValueError) as e:
+        _ = compare_images(a, b)
+    assert "cannot compare" in str(e)
+
+
+def test_compare_images_diff_path():
+    a = np.zeros((4, 6, 3), dtype=np.uint8)
+    b = a.copy()
+    b[2, 3, 1] = 128
+
+    with TemporaryDirectory() as tmp:
+        diff_path = Path(tmp) / "diff.png"
+        compare_images(array_to_image(a), array_to_image(b), diff_path=diff_path)
+        diff = image_to_array(f3d.Image(diff_path))
+
+    assert diff.shape == (4, 6, 1)
+    assert diff[2, 3, 0] == 128
+    assert np.count_nonzero(diff) == 1
+
+
+def test_compare_image_directories():
+    with TemporaryDirectory() as tmp:
+        ref_dir, new_dir, diff_dir = (Path(tmp) / d for d in ("ref", "new", "diff"))
+        for d in (ref_dir, new_dir, diff_dir):
+            d.mkdir()
+        for i in range(4):
+            ref = np.full((5, 7, 3), i * 10, dtype=np.uint8)
+            new = ref.copy()
+            new[:i, 0, 0] += 100
+            array_to_image(ref).save(ref_dir / f"{i}.png")
+            array_to_image(new).save(new_dir / f"{i}.png")
+
+        results = compare_image_directories(
+            ref_dir, new_dir, diff_dir=diff_dir, max_workers=2
+        )
+
+        assert list(results.diffs) == [f"{i}.png" for i in range(4)]
+        assert [r.diff_pixel_count for r in results.diffs.values()] == [0, 1, 2, 3]
+        assert sorted(p.name for p in diff_dir.iterdir()) == list(results.diffs)
+        assert results.failed == ["1.png", "2.png", "3.png"]
+        assert not results.errors
+        assert not results.stopped_early
+
+
+def test_compare_image_directories_errors():
+    with TemporaryDirectory() as tmp:
+        ref_dir, new_dir = Path(tmp) / "ref", Path(tmp) / "new"
+        ref_dir.mkdir()
+        new_dir.mkdir()
+        for i in range(3):
+            array_to_image(np.zeros((5, 5, 3), dtype=np.uint8)).save(
+                ref_dir / f"{i}.png"
+            )
+        array_to_image(np.zeros((5, 5, 3), dtype=np.uint8)).save(new_dir / "0.png")
+        (new_dir / "2.png").write_bytes(b"not an image")
+
+        results = compare_image_directories(ref_dir, new_dir, max_workers=2)
+
+        assert list(results.diffs) == ["0.png"]
+        assert list(results.errors) == ["1.png", "2.png"]
+        assert "no candidate image" in results.errors["1.png"]
+        assert results.failed == ["1.png", "2.png"]
+        assert not results.passed
+        assert not results.stopped_early
+
+
+def test_compare_image_directories_fail_fast():
+    with TemporaryDirectory() as tmp:
+        ref_dir, new_dir = Path(tmp) / "ref", Path(tmp) / "new"
+        ref_dir.mkdir()
+        new_dir.mkdir()
+        for i in range(20):
+            array_to_image(np.zeros((5, 5, 3), dtype=np.uint8)).save(
+                ref_dir / f"{i:02d}.png"
+            )
+            array_to_image(np.full((5, 5, 3), 255, dtype=np.uint8)).save(
+                new_dir / f"{i:02d}.png"
+            )
+
+        results = compare_image_directories(
+            ref_dir, new_dir, max_workers=1, fail_fast=True
+        )
+
+        assert 1 <= len(results.diffs) < 20
+        assert not any(r.passed() for r in results.diffs.values())
+        assert results.stopped_early
+        assert not results.passed
+
+
+def render_reference(engine: f3d.Engine, camera: dict):
+    engine.window.camera.state = f3d.CameraState(
+        camera["position"],
+        camera["focalPoint"],
+        camera["viewUp"],
+        camera["viewAngle"],
+    )
+    image = engine.window.render_to_image()
+    image.set_metadata("camera", json.dumps(camera))
+    return image
+
+
+CAMERA = {
+    "position": [1, 2, 3],
+    "focalPoint": [0, 0, 0],
+    "viewUp": [0, 1, 0],
+    "viewAngle": 30,
+}
+OPTIONS = {"render.grid.enable": True, "scene.up_direction": "+y"}
+
+
+def test_render_and_compare():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 32, 24
+    engine.options.update(OPTIONS)
+    reference = render_reference(engine, CAMERA)
+
+    engine.window.size = 50, 50
+    engine.window.camera.position = 10, 10, 10
+    diff = render_and_compare(engine, reference)
+
+    assert engine.window.size == (32, 24)
+    assert engine.window.camera.position == approx(CAMERA["position"])
+    assert diff.pixel_count == 32 * 24
+    assert diff.max_abs_error < 0.1
+
+
+def test_check_render_regressions():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 32, 24
+    engine.options.update(OPTIONS)
+
+    with TemporaryDirectory() as tmp:
+        for i in range(3):
+            camera = {**CAMERA, "position": [1 + i, 2, 3]}
+            render_reference(engine, camera).save(Path(tmp) / f"{i}.png")
+
+        results = check_render_regressions(tmp, [], OPTIONS, max_workers=2)
+
+    assert list(results.diffs) == ["0.png", "1.png", "2.png"]
+    assert all(r.pixel_count == 32 * 24 for r in results.diffs.values())
+    assert all(r.max_abs_error < 0.1 for r in results.diffs.values())
+
+
+def test_check_render_regressions_no_camera():
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "no-camera.png"
+        array_to_image(np.zeros((4, 4, 3), dtype=np.uint8)).save(path)
+
+        results = check_render_regressions(tmp, [], max_workers=1)
+
+    assert list(results.errors) == ["no-camera.png"]
+    assert results.errors["no-camera.png"] == f"no camera metadata in {path}"
@@ -0,0 +1,118 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event
+
+import f3d
+from pytest import mark
+
+from f3d_extras.progressive import RenderPass, even_size, progressive_turntable_video
+
+
+def create_engine():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 64, 48
+    engine.options["render.effect.antialiasing.enable"] = True
+    engine.options["render.grid.enable"] = True
+    engine.window.camera.position = 1, 1, 1
+    return engine
+
+
+class CountdownEvent(Event):
+    """An event that reports being set after `is_set` has been called `count` times."""
+
+    def __init__(self, count: int):
+        super().__init__()
+        self.count = count
+
+    def is_set(self):
+        self.count -= 1
+        return self.count < 0 or super().is_set()
+
+
+@mark.parametrize(
+    "size, expected", [(16, 16), (15.2, 16), (17.2, 18), (0.3, 2), (640 * 0.25, 160)]
+)
+def test_even_size(size: float, expected: int):
+    assert even_size(size) == expected
+
+
+def test_progressive_turntable_video():
+    engine = create_engine()
+    camera_position = engine.window.camera.position
+    previews: list[RenderPass] = []
+
+    def approve(preview: RenderPass):
+        previews.append(preview)
+        return preview.path.is_file()
+
+    with TemporaryDirectory() as tmp:
+        preview_path, final_path = Path(tmp) / "preview.mp4", Path(tmp) / "final.mp4"
+        result = progressive_turntable_video(
+            engine,
+            preview_path,
+            final_path,
+            fps=10,
+            duration=1,
+            preview_scale=0.5,
+            preview_fps=5,
+            approve_preview=approve,
+        )
+
+        assert previews == [result.preview]
+        assert result.preview.resolution == (32, 24)
+        assert result.preview.fps == 5
+        assert result.preview.frame_count == 5
+        assert result.preview.seconds > 0
+        assert not result.preview.cancelled
+        assert preview_path.is_file()
+
+        assert result.final is not None
+        assert result.final.resolution == (64, 48)
+        assert result.final.fps == 10
+        assert result.final.frame_count == 10
+        assert result.final.seconds > 0
+        assert not result.final.cancelled
+        assert final_path.is_file()
+
+    assert engine.window.size == (64, 48)
+    assert engine.window.camera.position == camera_position
+    assert engine.options["render.effect.antialiasing.enable"] is True
+
+
+def test_progressive_turntable_video_rejected():
+    engine = create_engine()
+
+    with TemporaryDirectory() as tmp:
+        final_path = Path(tmp) / "final.mp4"
+        result = progressive_turntable_video(
+            engine,
+            Path(tmp) / "preview.mp4",
+            final_path,
+            fps=10,
+            duration=1,
+            approve_preview=lambda _: False,
+        )
+
+        assert result.preview.path.is_file()
+        assert result.final is None
+        assert not final_path.exists()
+
+
+def test_progressive_turntable_video_cancelled():
+    engine = create_engine()
+
+    with TemporaryDirectory() as tmp:
+        final_path = Path(tmp) / "final.mp4"
+        result = progressive_turntable_video(
+            engine,
+            Path(tmp) / "preview.mp4",
+            final_path,
+            fps=10,
+            duration=1,
+            cancel=CountdownEvent(4),  # once before the final pass, then per frame
+        )
+
+        assert result.final is not None
+        assert result.final.cancelled
+        assert result.final.frame_count == 4
+        assert not final_path.exists()
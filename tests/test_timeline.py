@@ -0,0 +1,88 @@
+import f3d
+import numpy as np
+import pytest
+from pytest import approx, raises  # type: ignore
+
+from f3d_extras.images import image_to_array
+from f3d_extras.timeline import frame_times, render_frames, subframe_times
+
+
+@pytest.mark.parametrize(
+    "fps, duration, expected_count",
+    [
+        (30, 5, 150),
+        (30, 1, 30),  # accumulating `1 / 30` would yield 31 frames
+        (10, 0.3, 3),
+        (24, 2.5, 60),
+        (29.97, 10, 300),
+    ],
+)
+def test_frame_times(fps: float, duration: float, expected_count: int):
+    times = list(frame_times(fps, duration))
+
+    assert len(times) == expected_count
+    assert times[0] == 0
+    assert times == approx([i / expected_count for i in range(expected_count)])
+    assert all(0 <= t < 1 for t in times)
+
+
+def test_subframe_times():
+    times = list(subframe_times(2, 2, 4, shutter=0.5))
+
+    assert len(times) == 4
+    assert times[0] == approx((0, 0.03125, 0.0625, 0.09375))
+    assert times[3] == approx((0.75, 0.78125, 0.8125, 0.84375))
+    assert [s[0] for s in times] == list(frame_times(2, 2))
+
+    with raises(ValueError):
+        _ = list(subframe_times(2, 2, 0))
+
+
+@pytest.mark.parametrize("shutter", [0, -0.5, 1.5])
+def test_subframe_times_invalid_shutter(shutter: float):
+    with raises(ValueError) as e:
+        _ = list(subframe_times(2, 2, 4, shutter=shutter))
+    assert "shutter" in str(e)
+
+
+def background_interpolator(engine: f3d.Engine, frame_count: int):
+    """Set a white background during the second half of each frame, black otherwise."""
+
+    def f(t: float):
+        c = 1.0 if (t * frame_count) % 1 >= 0.5 - 1e-9 else 0.0
+        engine.options["render.background.color"] = (c, c, c)
+
+    return f
+
+
+def test_render_frames():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 8, 6
+    fps, duration = 5, 2
+    times: list[float] = []
+
+    images = list(render_frames(engine, times.append, fps, duration))
+
+    assert len(images) == 10
+    assert times == list(frame_times(fps, duration))
+    assert all((i.width, i.height) == (8, 6) for i in images)
+
+
+def test_render_frames_subframes():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 8, 6
+    fps, duration = 5, 2
+    interpolator = background_interpolator(engine, fps * duration)
+
+    sharp = [
+        image_to_array(i) for i in render_frames(engine, interpolator, fps, duration)
+    ]
+    blurred = [
+        image_to_array(i)
+        for i in render_frames(engine, interpolator, fps, duration, subframes=4)
+    ]
+
+    assert len(blurred) == 10
+    assert all(np.all(a == 0) for a in sharp)
+    assert all(a.shape == (6, 8, 3) for a in blurred)
+    assert all(np.all(a == 128) for a in blurred)  # rint(255 / 2)
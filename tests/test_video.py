@@ -1,15 +1,19 @@
+import asyncio
 import subprocess
 from itertools import repeat
-from tempfile import NamedTemporaryFile
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 import f3d
-from pytest import mark
+from pytest import MonkeyPatch, mark, raises
 
 from f3d_extras.video import (
     ffmpeg_encode_sequence,
+    ffmpeg_encode_sequence_async,
     ffmpeg_output_args_mp4,
     ffmpeg_output_args_webm,
     image_sequence_to_video,
+    image_sequence_to_video_async,
 )
 
 
@@ -65,3 +69,130 @@ def test_ffmpeg_encode_sequence(
         assert f"Duration: 00:00:{duration:02d}" in ffprobe
         assert f"{fps} fps" in ffprobe
         assert search in ffprobe
+
+
+def record_subprocesses(monkeypatch: MonkeyPatch):
+    """Record the subprocesses created by `asyncio.create_subprocess_exec`, and how
+    many of them were alive at once at most."""
+    procs: list[asyncio.subprocess.Process] = []
+    peak = [0]
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def record_subprocess_exec(*args, **kwargs):
+        proc = await create_subprocess_exec(*args, **kwargs)
+        procs.append(proc)
+        peak[0] = max(peak[0], sum(p.returncode is None for p in procs))
+        return proc
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", record_subprocess_exec)
+    return procs, peak
+
+
+def test_ffmpeg_encode_sequence_async(monkeypatch: MonkeyPatch):
+    procs, peak = record_subprocesses(monkeypatch)
+    w, h = 12, 8
+    fps = 5
+    duration = 2
+
+    async def frames():
+        for _ in range(fps * duration):
+            await asyncio.sleep(0)
+            yield b"\0" * w * h * 3
+
+    with TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"{i}.mp4" for i in range(4)]
+
+        async def encode_all():
+            semaphore = asyncio.Semaphore(2)
+            await asyncio.gather(
+                *(
+                    ffmpeg_encode_sequence_async(
+                        frames(), (w, h), fps, path, semaphore=semaphore
+                    )
+                    for path in paths
+                )
+            )
+
+        asyncio.run(encode_all())
+
+        assert len(procs) == 4
+        assert peak[0] == 2
+        assert all(p.returncode == 0 for p in procs)
+
+        for path in paths:
+            ffprobe = subprocess.check_output(
+                ["ffprobe", path], text=True, stderr=subprocess.STDOUT
+            )
+            assert f"{w}x{h}" in ffprobe
+            assert f"Duration: 00:00:{duration:02d}" in ffprobe
+            assert f"{fps} fps" in ffprobe
+
+
+def test_ffmpeg_encode_sequence_async_cancel(monkeypatch: MonkeyPatch):
+    w, h = 12, 8
+    procs, _ = record_subprocesses(monkeypatch)
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cancelled.mp4"
+        stalled = asyncio.Event()
+
+        async def frames():
+            for _ in range(3):
+                yield b"\0" * w * h * 3
+            stalled.set()
+            await asyncio.Event().wait()  # ffmpeg keeps waiting on stdin
+
+        async def encode_and_cancel():
+            task = asyncio.create_task(
+                ffmpeg_encode_sequence_async(frames(), (w, h), 5, path)
+            )
+            await stalled.wait()
+            task.cancel()
+            with raises(asyncio.CancelledError):
+                await asyncio.wait_for(task, 30)
+
+        asyncio.run(encode_and_cancel())
+
+        assert len(procs) == 1
+        assert procs[0].returncode is not None
+        assert not path.exists()
+
+
+def test_ffmpeg_encode_sequence_async_error():
+    w, h = 12, 8
+
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "missing" / "out.mp4"
+
+        with raises(subprocess.CalledProcessError):
+            asyncio.run(
+                ffmpeg_encode_sequence_async(
+                    repeat(b"\0" * w * h * 3, 10), (w, h), 5, path, loglevel="quiet"
+                )
+            )
+
+        assert not path.exists()
+
+
+def test_image_sequence_to_video_async():
+    engine = f3d.Engine.create(offscreen=True)
+    engine.window.size = 12, 34
+    fps = 5
+    duration = 2
+
+    with NamedTemporaryFile(suffix=".mp4") as tmp:
+        asyncio.run(
+            image_sequence_to_video_async(
+                (engine.window.render_to_image() for _ in range(fps * duration)),
+                fps,
+                tmp.name,
+            )
+        )
+
+        ffprobe = subprocess.check_output(
+            ["ffprobe", tmp.name], text=True, stderr=subprocess.STDOUT
+        )
+        w, h = engine.window.size
+        assert f"{w}x{h}" in ffprobe
+        assert f"Duration: 00:00:{duration:02d}" in ffprobe
+        assert f"{fps} fps" in ffprobe